@@ -1,18 +1,88 @@
 import os
 import json
+import gzip
 import re
-import copy
+import stat
+import tempfile
+import threading
 from datetime import datetime
+from functools import lru_cache
+from operator import itemgetter
 from flask import Flask, render_template, request, redirect, url_for, session
 from uuid import uuid4
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import redis
+except ImportError:
+    redis = None
+
 app = Flask(__name__)
 app.secret_key = os.environ.get('SECRET_KEY', os.urandom(24).hex())
 
+# Set REDIS_URL to store summoned creatures server-side, keyed by a per-browser id in the
+# session cookie. Otherwise they are kept in the signed cookie session itself, which survives
+# restarts and works across workers as long as SECRET_KEY is set.
+REDIS_URL = os.environ.get('REDIS_URL')
+if REDIS_URL and redis is None:
+    raise RuntimeError('REDIS_URL is set but the redis package is not installed')
+_redis = redis.Redis.from_url(REDIS_URL) if REDIS_URL else None
+# Summons expire after this long without a write, so abandoned browsers don't pile up.
+# Writes make the session cookie permanent with the same lifetime as the Redis entries.
+SUMMONED_TTL_SECONDS = int(os.environ.get('SUMMONED_TTL_SECONDS', 30 * 24 * 60 * 60))
+app.permanent_session_lifetime = SUMMONED_TTL_SECONDS
+# Most creatures one browser can have summoned at once (Conjure Animals from a 9th-level slot)
+SUMMONED_MAX_PER_BROWSER = 24
+
 SRD_MONSTERS_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), 'data', 'srd_5e_monsters.json'))
 SPELLS_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), 'data', 'spells.json'))
 PLAYER_DATA_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), 'data', 'player_data.json'))
 
+def _load_json(path):
+    """Parse a JSON file, using orjson when it is installed."""
+    with open(path, 'rb') as f:
+        return _parse_json(f.read())
+
+# orjson only handles 64-bit integers: it reads wider ones as floats and refuses to write
+# them, so anything with that many digits in a row goes through the stdlib json module
+_WIDE_NUMBER_RE = re.compile(r'\d{19}')
+_WIDE_NUMBER_BYTES_RE = re.compile(rb'\d{19}')
+
+def _parse_json(raw):
+    """Parse JSON text or bytes, using orjson when it is installed."""
+    if orjson is not None:
+        wide_re = _WIDE_NUMBER_BYTES_RE if isinstance(raw, (bytes, bytearray)) else _WIDE_NUMBER_RE
+        if wide_re.search(raw) is None:
+            try:
+                return orjson.loads(raw)
+            except orjson.JSONDecodeError:
+                pass  # Possibly NaN or Infinity, which the stdlib accepts; it re-raises real errors
+    return json.loads(raw)
+
+def _dump_json(data):
+    """Serialize data to compact JSON bytes, using orjson when it is installed."""
+    if orjson is not None:
+        try:
+            out = orjson.dumps(data)
+        except TypeError:
+            pass  # Integers wider than 64 bits; the stdlib handles them
+        else:
+            # orjson writes NaN and Infinity as null, so only a null needs the stdlib's opinion
+            if b'null' not in out:
+                return out
+    return json.dumps(data, separators=(',', ':')).encode('utf-8')
+
+# Single-scan pattern for stat block strings such as "58 (9d8 + 18)": the lookahead
+# captures any leading max HP, then the first NdM anywhere in the string is the hit dice
+_HP_RE = re.compile(r'(?=(\d*))(?:.*?(\d+d\d+))?', re.S)
+
+# Trait names, marked up as "<strong>Trait Name.</strong>" at the start of each trait description
+_TRAIT_RE = re.compile(r'<strong>([^<]+?)\.?</strong>')
+
 # Multiclassing prerequisites per 5e SRD
 MULTICLASS_PREREQUISITES = {
     "Barbarian": {"strength": 13},
@@ -29,12 +99,12 @@ MULTICLASS_PREREQUISITES = {
     "Wizard": {"intelligence": 13}
 }
 
-# Spellcaster level multipliers for multiclass spell slot calculation
-SPELLCASTER_MULTIPLIERS = {
-    "full": 1,      # Bard, Cleric, Druid, Sorcerer, Wizard
-    "half": 0.5,    # Paladin, Ranger
-    "third": 0.34,  # Eldritch Knight Fighter, Arcane Trickster Rogue
-    "none": 0
+# Spellcaster level divisors for multiclass spell slot calculation
+# (classes not listed, including "none" and Warlock "pact", add nothing)
+SPELLCASTER_DIVISORS = {
+    "full": 1,   # Bard, Cleric, Druid, Sorcerer, Wizard
+    "half": 2,   # Paladin, Ranger
+    "third": 3   # Eldritch Knight Fighter, Arcane Trickster Rogue
 }
 
 # Hit dice by class
@@ -93,6 +163,13 @@ MULTICLASS_SPELL_SLOTS = {
     20: [4, 3, 3, 3, 3, 2, 2, 1, 1],
 }
 
+# Finished spell slot dicts indexed by spellcaster level 0-20 (shared, treat as read-only)
+_SPELL_SLOT_LEVEL_NAMES = ('1st', '2nd', '3rd', '4th', '5th', '6th', '7th', '8th', '9th')
+_SPELL_SLOTS_TABLE = [{}] + [
+    {name: count for name, count in zip(_SPELL_SLOT_LEVEL_NAMES, MULTICLASS_SPELL_SLOTS[level]) if count > 0}
+    for level in range(1, 21)
+]
+
 # Default player data structure with multiclass support
 DEFAULT_PLAYER_DATA = {
     "name": "",
@@ -145,6 +222,14 @@ DEFAULT_PLAYER_DATA = {
     }
 }
 
+# Serialized once so fresh copies can be made by parsing instead of deepcopy
+_DEFAULT_PLAYER_JSON = _dump_json(DEFAULT_PLAYER_DATA)
+
+def default_player_data():
+    """Return a fresh, independent copy of DEFAULT_PLAYER_DATA."""
+    return _parse_json(_DEFAULT_PLAYER_JSON)
+
+@lru_cache(maxsize=32)
 def calculate_proficiency_bonus(total_level):
     """Calculate proficiency bonus based on total character level."""
     if total_level >= 17:
@@ -160,25 +245,17 @@ def calculate_proficiency_bonus(total_level):
 
 def calculate_spellcaster_level(classes):
     """Calculate multiclass spellcaster level per 5e SRD rules."""
-    total = 0
+    # Sum levels per caster type, then round each type's share down
+    levels_by_type = {}
     for cls in classes:
         spellcasting = cls.get('spellcasting', CLASS_SPELLCASTING.get(cls.get('name', ''), 'none'))
-        level = cls.get('level', 0)
-        multiplier = SPELLCASTER_MULTIPLIERS.get(spellcasting, 0)
-        total += level * multiplier
-    return int(total)
+        if spellcasting in SPELLCASTER_DIVISORS:
+            levels_by_type[spellcasting] = levels_by_type.get(spellcasting, 0) + cls.get('level', 0)
+    return sum(int(levels) // SPELLCASTER_DIVISORS[t] for t, levels in levels_by_type.items())
 
 def get_spell_slots(spellcaster_level):
     """Get spell slots for a given spellcaster level."""
-    if spellcaster_level <= 0:
-        return {}
-    slots = MULTICLASS_SPELL_SLOTS.get(min(spellcaster_level, 20), [0]*9)
-    result = {}
-    level_names = ['1st', '2nd', '3rd', '4th', '5th', '6th', '7th', '8th', '9th']
-    for i, count in enumerate(slots):
-        if count > 0:
-            result[level_names[i]] = count
-    return result
+    return _SPELL_SLOTS_TABLE[min(max(spellcaster_level, 0), 20)]
 
 def calculate_hit_dice(classes):
     """Calculate total hit dice pool from all classes."""
@@ -204,18 +281,6 @@ def get_class_level(classes, class_name):
             return cls.get('level', 0)
     return 0
 
-# Conjuring spells that summon creatures
-CONJURE_SPELL_NAMES = [
-    'Conjure Animals',
-    'Conjure Minor Elementals',
-    'Conjure Woodland Beings',
-    'Conjure Celestial',
-    'Conjure Elemental',
-    'Conjure Fey',
-    'Find Familiar',
-    'Find Steed'
-]
-
 # Mapping of spells to the types of creatures they can summon
 SPELL_CREATURE_MAPPINGS = {
     'Conjure Animals': {'cr_max': 2, 'types': ['beast']},
@@ -228,33 +293,178 @@ SPELL_CREATURE_MAPPINGS = {
     'Find Steed': {'cr_max': 2, 'types': ['beast'], 'specific': ['Warhorse', 'Pony', 'Camel', 'Elk', 'Mastiff']}
 }
 
+# Conjuring spells that summon creatures
+CONJURE_SPELL_NAMES = frozenset(SPELL_CREATURE_MAPPINGS)
+
+def _parse_cr(challenge):
+    """Parse a Challenge string such as '1/4 (50 XP)' into a float CR."""
+    parts = str(challenge).split()
+    token = parts[0] if parts else ''
+    num, slash, denom = token.partition('/')
+    if slash:
+        if num.isdigit() and denom.isdigit() and int(denom):
+            return int(num) / int(denom)
+        return 0
+    if token.replace('.', '', 1).isdigit():
+        return float(token)
+    return 0
+
+def parse_hit_points(hit_points_str):
+    """Parse max HP and hit dice from a string like '58 (9d8 + 18)'."""
+    hp_max_digits, hit_dice = _HP_RE.match(hit_points_str).groups()
+    hp_max = int(hp_max_digits) if hp_max_digits else 0
+    return hp_max, hit_dice or ''
+
+# Static SRD datasets, parsed once at import and shared read-only by all requests.
+# Monsters are kept in name order so filtered views come out sorted without re-sorting.
+_SRD_MONSTERS = tuple(sorted(_load_json(SRD_MONSTERS_PATH), key=lambda m: m.get('name', '')))
+_SPELLS = tuple(_load_json(SPELLS_PATH))
+
+# Derived fields computed once per monster; underscore keys are kept out of rendered stat blocks
+for _monster in _SRD_MONSTERS:
+    _monster['_cr'] = _parse_cr(_monster.get('Challenge', '0'))
+    _monster['_cr_token'] = (str(_monster.get('Challenge', '')).split() or [''])[0]
+    _monster['_name_lower'] = _monster.get('name', '').lower()
+    _monster['_meta_lower'] = _monster.get('meta', '').lower()
+    _monster['_skills_lower'] = _monster.get('Skills', '').lower()
+    _monster['_traits_lower'] = _monster.get('Traits', '').lower()
+    _monster['_trait_names'] = frozenset(_TRAIT_RE.findall(_monster.get('Traits', '')))
+    _monster['_hp_max'], _monster['_hit_dice'] = parse_hit_points(_monster.get('Hit Points', ''))
+
+# Numeric spell level for sorting; cantrips and unparseable levels sort as 0
+for _spell in _SPELLS:
+    _level = str(_spell.get('level', '0'))
+    _spell['_level_num'] = int(_level) if _level.isdigit() else 0
+
+# Lookup indexes over the monster and spell data
+_MONSTER_BY_NAME_LOWER = {m['_name_lower']: m for m in _SRD_MONSTERS}
+_SPELL_BY_NAME_LOWER = {s['name'].lower(): s for s in _SPELLS}
+_MONSTERS_BY_CHALLENGE = {}
+for _monster in _SRD_MONSTERS:
+    _MONSTERS_BY_CHALLENGE.setdefault(str(_monster.get('Challenge', '')), []).append(_monster)
+
+# Conjuring spells, filtered and sorted by level once since the spell data is static
+_CONJURE_SPELLS = tuple(sorted((spell for spell in _SPELLS if spell.get('name') in CONJURE_SPELL_NAMES),
+                               key=itemgetter('_level_num')))
+
+def _find_summonable_creatures(mapping):
+    """Filter the SRD monsters down to those a spell mapping can summon."""
+    # Results follow _SRD_MONSTERS, which is already in name order
+    # If specific creatures are listed, use those
+    if 'specific' in mapping:
+        specific_names = {n.lower() for n in mapping['specific']}
+        return [m for m in _SRD_MONSTERS if m['_name_lower'] in specific_names]
+    # Filter by CR and type
+    cr_max = mapping['cr_max']
+    types = [t.lower() for t in mapping['types']]
+    return [m for m in _SRD_MONSTERS
+            if m['_cr'] <= cr_max and any(t in m['_meta_lower'] for t in types)]
+
+# The spell mappings and monster data are static, so each spell's creature list is too
+_SUMMONABLE_BY_SPELL = {spell_name: _find_summonable_creatures(mapping)
+                        for spell_name, mapping in SPELL_CREATURE_MAPPINGS.items()}
+
+def _filter_options(creatures):
+    """Collect the CR, skill and trait dropdown options for a list of creatures."""
+    # Extract unique CRs and skills for filter dropdowns
+    cr_values = {c['_cr_token']: c['_cr'] for c in creatures if c['_cr_token']}
+    
+    skills = set()
+    for c in creatures:
+        skill_str = c.get('Skills', '')
+        if skill_str:
+            for part in skill_str.split(','):
+                skill_name = part.strip().split()[0] if part.strip() else ''
+                if skill_name:
+                    skills.add(skill_name)
+    
+    # Extract common traits
+    traits = set().union(*(c['_trait_names'] for c in creatures))
+    
+    return {'crs': sorted(cr_values, key=cr_values.get), 'skills': sorted(skills), 'traits': sorted(traits)}
+
+# Filter dropdowns on the spell detail page depend only on the spell's creature list
+_SPELL_FILTER_OPTIONS = {spell_name: _filter_options(creatures)
+                         for spell_name, creatures in _SUMMONABLE_BY_SPELL.items()}
+_NO_FILTER_OPTIONS = _filter_options([])
+
 def load_srd_monsters():
-    with open(SRD_MONSTERS_PATH, 'r') as f:
-        return json.load(f)
+    return _SRD_MONSTERS
 
 def load_spells():
-    with open(SPELLS_PATH, 'r') as f:
-        return json.load(f)
+    return _SPELLS
+
+def get_monster_by_name(name):
+    """Look up an SRD monster by name, case-insensitively; None if unknown."""
+    return _MONSTER_BY_NAME_LOWER.get(name.lower())
+
+def get_spell_by_name(name):
+    """Look up a spell by name, case-insensitively; None if unknown."""
+    return _SPELL_BY_NAME_LOWER.get(name.lower())
+
+# Merged player data as serialized JSON, along with the file mtime it was read at.
+# Requests parse a fresh copy from this rather than re-reading the file.
+_PLAYER_CACHE = None
+_PLAYER_MTIME = None
+# Serializes swapping in a saved file with updating the cache, since requests run on threads
+_PLAYER_LOCK = threading.Lock()
+
+def _merge_player_data(data):
+    """Merge stored player data with defaults to ensure all fields exist."""
+    merged = default_player_data()
+    class_features = merged['class_features']
+    merged.update(data)
+    # Ensure class_features dict is complete
+    if 'class_features' in data:
+        class_features.update(data.get('class_features', {}))
+        merged['class_features'] = class_features
+    return merged
 
 def load_player_data():
     """Load player data from JSON file, creating it if it doesn't exist."""
-    if os.path.exists(PLAYER_DATA_PATH):
-        with open(PLAYER_DATA_PATH, 'r') as f:
-            data = json.load(f)
-            # Merge with defaults to ensure all fields exist
-            merged = copy.deepcopy(DEFAULT_PLAYER_DATA)
-            merged.update(data)
-            # Ensure class_features dict is complete
-            if 'class_features' in data:
-                merged['class_features'] = copy.deepcopy(DEFAULT_PLAYER_DATA['class_features'])
-                merged['class_features'].update(data.get('class_features', {}))
-            return merged
-    return copy.deepcopy(DEFAULT_PLAYER_DATA)
+    global _PLAYER_CACHE, _PLAYER_MTIME
+    try:
+        mtime = os.stat(PLAYER_DATA_PATH).st_mtime_ns
+    except FileNotFoundError:
+        return default_player_data()
+    if _PLAYER_CACHE is None or mtime != _PLAYER_MTIME:
+        _PLAYER_CACHE = _dump_json(_merge_player_data(_load_json(PLAYER_DATA_PATH)))
+        _PLAYER_MTIME = mtime
+    return _parse_json(_PLAYER_CACHE)
 
 def save_player_data(data):
-    """Save player data to JSON file."""
-    with open(PLAYER_DATA_PATH, 'w') as f:
-        json.dump(data, f, indent=4)
+    """Save player data to JSON file, skipping the write if nothing changed."""
+    global _PLAYER_CACHE, _PLAYER_MTIME
+    merged = _dump_json(_merge_player_data(data))
+    try:
+        unchanged = merged == _PLAYER_CACHE and os.stat(PLAYER_DATA_PATH).st_mtime_ns == _PLAYER_MTIME
+    except FileNotFoundError:
+        unchanged = False
+    if unchanged:
+        return
+    # mkstemp creates the file 0600; keep the existing file's mode, or the umask default
+    try:
+        mode = stat.S_IMODE(os.stat(PLAYER_DATA_PATH).st_mode)
+    except FileNotFoundError:
+        umask = os.umask(0)
+        os.umask(umask)
+        mode = 0o666 & ~umask
+    # Write to a temp file of our own and swap it in, so a crash never leaves a truncated
+    # file and concurrent saves never replace each other's half-written temp files
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(PLAYER_DATA_PATH),
+                                    prefix=os.path.basename(PLAYER_DATA_PATH) + '.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            os.fchmod(f.fileno(), mode)
+            f.write(_dump_json(data))
+        with _PLAYER_LOCK:
+            os.replace(tmp_path, PLAYER_DATA_PATH)
+            _PLAYER_CACHE = merged
+            _PLAYER_MTIME = os.stat(PLAYER_DATA_PATH).st_mtime_ns
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
 
 def get_player_class_features():
     """Get the player's active class features that affect summoning."""
@@ -262,60 +472,72 @@ def get_player_class_features():
     return player.get('class_features', {})
 
 def get_conjure_spells():
-    """Load and return only the conjuring/summoning spells."""
-    spells = load_spells()
-    return [spell for spell in spells if spell.get('name') in CONJURE_SPELL_NAMES]
+    """Return only the conjuring/summoning spells, sorted by level."""
+    return _CONJURE_SPELLS
 
 def get_summonable_creatures(spell_name):
     """Get creatures that can be summoned by a specific spell."""
-    if spell_name not in SPELL_CREATURE_MAPPINGS:
-        return []
-    
-    mapping = SPELL_CREATURE_MAPPINGS[spell_name]
-    monsters = load_srd_monsters()
-    creatures = []
-    
-    # If specific creatures are listed, use those
-    if 'specific' in mapping:
-        specific_names = [n.lower() for n in mapping['specific']]
-        for monster in monsters:
-            if monster.get('name', '').lower() in specific_names:
-                creatures.append(monster)
-    else:
-        # Filter by CR and type
-        cr_max = mapping['cr_max']
-        types = [t.lower() for t in mapping['types']]
-        
-        for monster in monsters:
-            # Parse CR
-            cr_str = str(monster.get('Challenge', '0'))
-            try:
-                if '/' in cr_str:
-                    num, denom = cr_str.split('/')
-                    cr = float(num) / float(denom)
-                else:
-                    cr = float(cr_str.split()[0])
-            except:
-                cr = 0
-            
-            # Check type from meta field
-            meta = monster.get('meta', '').lower()
-            is_valid_type = any(t in meta for t in types)
-            
-            if cr <= cr_max and is_valid_type:
-                creatures.append(monster)
-    
-    return sorted(creatures, key=lambda x: x.get('name', ''))
+    return _SUMMONABLE_BY_SPELL.get(spell_name, [])
 
-def get_summoned():
-    return session.setdefault('summoned', {})
+def _summoned_key(create=False):
+    """Return the Redis key for the current browser's summoned creatures.
 
-def parse_hit_points(hit_points_str):
-    hp_max_match = re.match(r'(\d+)', hit_points_str)
-    dice_match = re.search(r'(\d+d\d+)', hit_points_str)
-    hp_max = int(hp_max_match.group(1)) if hp_max_match else 0
-    hit_dice = dice_match.group(1) if dice_match else ''
-    return hp_max, hit_dice
+    Only writes pass ``create=True``; reads from a browser without a session id
+    return None so they don't mint one and force a new session cookie.
+    """
+    if 'sid' not in session:
+        if not create:
+            return None
+        session['sid'] = uuid4().hex
+    return f"summoned:{session['sid']}"
+
+def get_summoned():
+    """Return the current browser's summoned creatures, keyed by creature id."""
+    if _redis is None:
+        return dict(session.get('summoned', {}))
+    key = _summoned_key()
+    if key is None:
+        return {}
+    return {cid.decode(): _parse_json(raw) for cid, raw in _redis.hgetall(key).items()}
+
+def get_summoned_creature(creature_id):
+    """Return a single summoned creature, or None if it doesn't exist."""
+    if _redis is None:
+        creature = session.get('summoned', {}).get(creature_id)
+        return dict(creature) if creature is not None else None
+    key = _summoned_key()
+    if key is None:
+        return None
+    raw = _redis.hget(key, creature_id)
+    return _parse_json(raw) if raw is not None else None
+
+def store_summoned(creatures):
+    """Add or replace summoned creatures, given a dict keyed by creature id."""
+    if not creatures:
+        return
+    session.permanent = True
+    if _redis is None:
+        # Reassigning marks the cookie session modified so it is re-sent
+        session['summoned'] = {**session.get('summoned', {}), **creatures}
+        return
+    key = _summoned_key(create=True)
+    pipe = _redis.pipeline()
+    pipe.hset(key, mapping={cid: _dump_json(c) for cid, c in creatures.items()})
+    pipe.expire(key, SUMMONED_TTL_SECONDS)
+    pipe.execute()
+
+def remove_summoned_creature(creature_id):
+    """Remove a summoned creature if it exists."""
+    if _redis is None:
+        summoned = session.get('summoned', {})
+        if creature_id in summoned:
+            del summoned[creature_id]
+            session.modified = True
+        return
+    key = _summoned_key()
+    if key is None:
+        return
+    _redis.hdel(key, creature_id)
 
 @app.route('/')
 def index():
@@ -323,39 +545,48 @@ def index():
     cr_filter = request.args.get('cr', '')
 
     monsters = load_srd_monsters()
-    if search_query:
-        monsters = [m for m in monsters if search_query in m.get('name', '').lower()]
     if cr_filter:
-        monsters = [m for m in monsters if str(m.get('Challenge', '')).startswith(cr_filter)]
+        # Match against the handful of distinct Challenge strings, not every monster,
+        # applying the name search in the same pass
+        monsters = sorted((m for challenge, bucket in _MONSTERS_BY_CHALLENGE.items()
+                           if challenge.startswith(cr_filter)
+                           for m in bucket if search_query in m['_name_lower']),
+                          key=itemgetter('name'))
+    elif search_query:
+        monsters = [m for m in monsters if search_query in m['_name_lower']]
 
-    return render_template('index.html', creatures={m['name']: m for m in monsters}, search=search_query, cr=cr_filter)
+    return render_template('index.html', creatures=monsters, search=search_query, cr=cr_filter)
 
 @app.route('/creature/<name>')
 def creature(name):
-    monsters = load_srd_monsters()
-    creature = next((m for m in monsters if m.get('name', '').lower() == name.lower()), None)
+    creature = get_monster_by_name(name)
     if not creature:
         return "Creature not found", 404
-    hp_max, hit_dice = parse_hit_points(creature.get('Hit Points', ''))
+    hp_max, hit_dice = creature['_hp_max'], creature['_hit_dice']
+    creature = {k: v for k, v in creature.items() if not k.startswith('_')}
     return render_template('creature.html', name=name, creature=creature, hp_max=hp_max, hit_dice=hit_dice)
 
 @app.route('/summon/<name>', methods=['GET', 'POST'])
 def summon(name):
-    monsters = load_srd_monsters()
-    creature = next((m for m in monsters if m.get('name', '').lower() == name.lower()), None)
+    creature = get_monster_by_name(name)
     if not creature:
         return "Creature not found", 404
+    # Work on a copy so edits below never leak into the shared SRD data
+    creature = dict(creature)
 
-    hp_str = creature.get('Hit Points', '')
-    hp_max, hit_dice = parse_hit_points(hp_str)
+    hp_max, hit_dice = creature['_hp_max'], creature['_hit_dice']
     creature['hp_max'] = hp_max
     creature['hit_dice_value'] = hit_dice
 
     if request.method == 'POST':
-        quantity = int(request.form.get('quantity', 1))
+        # Never summon past the per-browser cap, whatever quantity the form asks for
+        room = SUMMONED_MAX_PER_BROWSER - len(get_summoned())
+        quantity = max(0, min(int(request.form.get('quantity', 1)), room))
         mighty_summoner = request.form.get('mighty_summoner') == 'on'
         hp_str = request.form.get('Hit Points', creature.get('Hit Points', ''))
-        hp_max, hit_dice = parse_hit_points(hp_str)
+        # Only a Hit Points override from the form needs parsing
+        if hp_str != creature.get('Hit Points', ''):
+            hp_max, hit_dice = parse_hit_points(hp_str)
         creature['Hit Points'] = hp_str
         creature['hp_max'] = hp_max
         creature['hit_dice_value'] = hit_dice
@@ -371,90 +602,76 @@ def summon(name):
             except Exception:
                 extra_hp = 0
 
-        summoned = get_summoned()
+        # Only per-summon state is stored; stat block text is looked up by name when rendering.
+        # Every clone starts identical, so build the entry once and copy it per id.
+        base_hp = hp_max + extra_hp
+        template = {
+            'name': creature['name'],
+            'Hit Points': f"{base_hp} ({creature.get('Hit Points', '')})",
+            'HP Max': base_hp,
+            'current_hp': base_hp,
+            'Hit Dice': hit_dice,
+            'Armor Class': creature.get('Armor Class', ''),
+            'abilities': {a: creature.get(a, '') for a in ['STR', 'DEX', 'CON', 'INT', 'WIS', 'CHA']},
+            'mighty_summoner': mighty_summoner,
+            'extra_hp': extra_hp,
+            'img_url': creature.get('img_url', ''),
+        }
+        summoned = {}
         for _ in range(quantity):
-            creature_id = str(uuid4())
-            creature_copy = copy.deepcopy(creature)
-            base_hp = hp_max + extra_hp
-            summoned[creature_id] = {
-                'id': creature_id,
-                'name': creature_copy['name'],
-                'Hit Points': f"{base_hp} ({creature_copy.get('Hit Points', '')})",
-                'HP Max': base_hp,
-                'current_hp': base_hp,
-                'Hit Dice': hit_dice,
-                'Armor Class': creature_copy.get('Armor Class', ''),
-                'STR': creature_copy.get('STR', ''),
-                'DEX': creature_copy.get('DEX', ''),
-                'CON': creature_copy.get('CON', ''),
-                'INT': creature_copy.get('INT', ''),
-                'WIS': creature_copy.get('WIS', ''),
-                'CHA': creature_copy.get('CHA', ''),
-                'abilities': {a: creature_copy.get(a, '') for a in ['STR', 'DEX', 'CON', 'INT', 'WIS', 'CHA']},
-                'skills': creature_copy.get('Skills', ''),
-                'traits': creature_copy.get('Traits', ''),
-                'actions': creature_copy.get('Actions', ''),
-                'spells': creature_copy.get('Spells', ''),
-                'equipment': creature_copy.get('Equipment', ''),
-                'mighty_summoner': mighty_summoner,
-                'extra_hp': extra_hp,
-                'img_url': creature_copy.get('img_url', ''),
-            }
-        session['summoned'] = summoned
+            creature_id = uuid4().hex
+            summoned[creature_id] = {'id': creature_id, **template, 'abilities': dict(template['abilities'])}
+        store_summoned(summoned)
         return redirect(url_for('summoned_creatures'))
 
     return render_template('summon.html', name=name, creature=creature, saved=False)
 
-@app.route('/summoned', methods=['GET', 'POST'])
+@app.route('/summoned')
 def summoned_creatures():
     summoned = get_summoned()
     player = load_player_data()
     
-    if request.method == 'POST':
-        creature_id = request.form.get('id')
-        new_hp = request.form.get('current_hp')
-        if creature_id in summoned and new_hp is not None:
-            # Update only the current HP, not the max HP string
-            try:
-                summoned[creature_id]['current_hp'] = int(new_hp)
-            except ValueError:
-                pass  # Ignore invalid input
-            session['summoned'] = summoned
-    
     # Get druid level for Bear Spirit temp HP calculation
     druid_level = get_class_level(player.get('classes', []), 'Druid')
     
     return render_template('summoned.html', 
                           summoned=summoned.values(), 
+                          stat_blocks=_MONSTER_BY_NAME_LOWER,
                           player=player,
                           druid_level=druid_level,
                           bear_spirit_active=player.get('class_features', {}).get('bear_spirit_active', False))
 
 @app.route('/remove_summoned/<creature_id>', methods=['POST'])
 def remove_summoned(creature_id):
-    summoned = get_summoned()
-    if creature_id in summoned:
-        del summoned[creature_id]
-        session['summoned'] = summoned
+    remove_summoned_creature(creature_id)
     return redirect(url_for('summoned_creatures'))
 
-@app.route('/update_summoned/<creature_id>', methods=['POST'])
+@app.route('/summoned/<creature_id>', methods=['POST'])
 def update_summoned(creature_id):
-    summoned = get_summoned()
-    if creature_id in summoned:
+    """Update current and/or temp HP for a summoned creature, saving only if something changed."""
+    creature = get_summoned_creature(creature_id)
+    if creature is not None:
+        dirty = False
         current_hp = request.form.get('current_hp')
         temp_hp = request.form.get('temp_hp')
         if current_hp is not None:
             try:
-                summoned[creature_id]['current_hp'] = int(current_hp)
+                current_hp = int(current_hp)
             except ValueError:
-                pass  # Ignore invalid input
+                current_hp = creature.get('current_hp')  # Ignore invalid input
+            if creature.get('current_hp') != current_hp:
+                creature['current_hp'] = current_hp
+                dirty = True
         if temp_hp is not None:
             try:
-                summoned[creature_id]['temp_hp'] = int(temp_hp)
+                temp_hp = max(0, int(temp_hp))
             except ValueError:
-                summoned[creature_id]['temp_hp'] = 0
-        session['summoned'] = summoned
+                temp_hp = 0
+            if creature.get('temp_hp') != temp_hp:
+                creature['temp_hp'] = temp_hp
+                dirty = True
+        if dirty:
+            store_summoned({creature_id: creature})
     return redirect(url_for('summoned_creatures'))
 
 @app.route('/toggle_bear_spirit', methods=['POST'])
@@ -473,29 +690,15 @@ def toggle_bear_spirit():
         # Temp HP = 5 + druid level (not total level per multiclass rules)
         druid_level = get_class_level(player.get('classes', []), 'Druid')
         temp_hp = 5 + druid_level
-        for creature_id in summoned:
-            # Only set temp HP if creature doesn't already have higher temp HP
-            current_temp_hp = summoned[creature_id].get('temp_hp', 0)
-            if temp_hp > current_temp_hp:
-                summoned[creature_id]['temp_hp'] = temp_hp
-        session['summoned'] = summoned
+        # Only set temp HP if creature doesn't already have higher temp HP
+        updated = {cid: c for cid, c in summoned.items() if temp_hp > c.get('temp_hp', 0)}
+        for creature in updated.values():
+            creature['temp_hp'] = temp_hp
+        # Writes nothing when no creature changed
+        store_summoned(updated)
     
     return redirect(url_for('summoned_creatures'))
 
-@app.route('/update_temp_hp/<creature_id>', methods=['POST'])
-def update_temp_hp(creature_id):
-    """Update temp HP for a specific creature."""
-    summoned = get_summoned()
-    if creature_id in summoned:
-        temp_hp = request.form.get('temp_hp')
-        if temp_hp is not None:
-            try:
-                summoned[creature_id]['temp_hp'] = max(0, int(temp_hp))
-            except ValueError:
-                summoned[creature_id]['temp_hp'] = 0
-        session['summoned'] = summoned
-    return redirect(url_for('summoned_creatures'))
-
 @app.route('/set_summoner_info', methods=['POST'])
 def set_summoner_info():
     session['summoner_class'] = request.form.get('summoner_class', '')
@@ -565,12 +768,13 @@ def player():
         character['proficiency_bonus'] = calculate_proficiency_bonus(character['total_level'])
         character['hit_dice'] = calculate_hit_dice(classes)
         
-        # Calculate spellcasting
+        # Calculate spellcasting, keeping the spells known we already have
+        spells_known_by_class = character.get('spellcasting', {}).get('spells_known_by_class', {})
         spellcaster_level = calculate_spellcaster_level(classes)
         character['spellcasting'] = {
             'spellcaster_level': spellcaster_level,
             'spell_slots': get_spell_slots(spellcaster_level),
-            'spells_known_by_class': character.get('spellcasting', {}).get('spells_known_by_class', {})
+            'spells_known_by_class': spells_known_by_class
         }
         
         # Update class features (checkboxes)
@@ -601,11 +805,23 @@ def player():
                           class_spellcasting=CLASS_SPELLCASTING,
                           multiclass_prereqs=MULTICLASS_PREREQUISITES)
 
+# D&D Beyond extractor bookmarklet, encoded and compressed once since it never changes
+BOOKMARKLET_CODE = '''javascript:(function(){'use strict';function e(e,t=''){const n=document.querySelector(e);return n?n.textContent.trim():t}function t(e,t=0){const n=parseInt(e.replace(/[^\\d-]/g,''),10);return isNaN(n)?t:n}function n(){const e=window.location.pathname.match(/\\/characters\\/(\\d+)/);return e?e[1]:null}function r(e){return{Barbarian:'d12',Bard:'d8',Cleric:'d8',Druid:'d8',Fighter:'d10',Monk:'d8',Paladin:'d10',Ranger:'d10',Rogue:'d8',Sorcerer:'d6',Warlock:'d8',Wizard:'d6'}[e]||'d8'}function a(e){return{Barbarian:'none',Bard:'full',Cleric:'full',Druid:'full',Fighter:'none',Monk:'none',Paladin:'half',Ranger:'half',Rogue:'none',Sorcerer:'full',Warlock:'pact',Wizard:'full'}[e]||'none'}function o(){const n=e('.ddbc-character-summary__classes, .ct-character-summary__classes'),o=[];if(n){const e=n.match(/([A-Za-z]+(?:\\s+[A-Za-z]+)?)\\s*(\\d+)/g);e&&e.forEach(e=>{const t=e.match(/([A-Za-z]+(?:\\s+[A-Za-z]+)?)\\s*(\\d+)/);t&&o.push({name:t[1].trim(),level:parseInt(t[2],10),subclass:'',hit_die:r(t[1].trim()),spellcasting:a(t[1].trim())})})}return o}function s(){const e={},n={STR:'strength',DEX:'dexterity',CON:'constitution',INT:'intelligence',WIS:'wisdom',CHA:'charisma'};return document.querySelectorAll('.ddbc-ability-summary, .ct-ability-summary, .ct-quick-info__ability, .ddbc-quick-info__ability').forEach(r=>{const a=r.querySelector('.ddbc-ability-summary__abbr, .ct-ability-summary__abbr'),o=r.querySelector('.ddbc-ability-summary__secondary, .ct-ability-summary__secondary, .ddbc-ability-summary__primary');if(a&&o){const r=a.textContent.trim().toUpperCase(),s=t(o.textContent);n[r]&&(e[n[r]]=s)}}),e}function c(){let n=0,r=0,a=0;const o=document.querySelector('.ct-health-summary__hp-number, .ddbc-health-summary__hp-number');o&&(n=t(o.textContent));const s=document.querySelector('.ct-health-summary__hp-max, .ddbc-health-summary__hp-max');s&&(r=t(s.textContent));const c=e('.ct-status-summary-mobile__hp, .ddbc-combat-mobile__hp');if(c&&c.includes('/')){const e=c.split('/');2===e.length&&(n=t(e[0]),r=t(e[1]))}const l=document.querySelector('[class*="temp-hp"] [class*="value"]');return l&&(a=t(l.textContent)),{current_hp:n,max_hp:r,temp_hp:a}}function l(){const e=document.querySelector('.ddbc-armor-class-box__value, .ct-armor-class-box__value');return e?t(e.textContent):10}function i(){const t=document.querySelector('.ddbc-speed-box__box-value, .ct-speed-box__box-value'),n=t?t.textContent.trim():'30';return n.includes('ft')?n:n+' ft'}function u(){const e=document.querySelector('.ddbc-proficiency-bonus-box__value, .ct-proficiency-bonus-box__value');return e?t(e.textContent):2}function d(e){const t={mighty_summoner:false,guardian_spirit:false,faithful_summons:false,bear_spirit_active:false},n=document.body.innerText.toLowerCase();return n.includes('mighty summoner')&&(t.mighty_summoner=true),n.includes('guardian spirit')&&(t.guardian_spirit=true),n.includes('faithful summons')&&(t.faithful_summons=true),t}try{if(!window.location.hostname.includes('dndbeyond.com')||!window.location.pathname.includes('/characters/'))return void alert('Please navigate to a D&D Beyond character sheet page first.');const t=n();if(!t)throw new Error('Could not find character ID.');const r=e('.ddbc-character-tidbits__heading h1, .ct-character-tidbits__heading h1'),a=e('.ddbc-character-summary__race, .ct-character-summary__race'),f=e('.ddbc-character-summary__background, .ct-character-summary__background'),m=o(),p=s(),_=c(),h=d(m),g={name:r,race:a,background:f,alignment:'',experience:0,classes:m,total_level:m.reduce((e,t)=>e+t.level,0),ability_scores:p,max_hp:_.max_hp,current_hp:_.current_hp,ac:l(),speed:i(),proficiency_bonus:u(),inspiration:0,proficiencies:{armor:[],weapons:[],tools:[],saving_throws:[],skills:[]},class_features:h,features:'',equipment:'',dndbeyond_sync:{character_id:t,character_url:window.location.href,last_sync:new Date().toISOString(),source:'dndbeyond_bookmarklet'}},b=JSON.stringify(g,null,2);navigator.clipboard.writeText(b).then(()=>{const e=document.createElement('div');e.style.cssText='position:fixed;top:20px;right:20px;background:#28a745;color:white;padding:20px;border-radius:8px;z-index:999999;font-family:Arial;box-shadow:0 4px 12px rgba(0,0,0,0.3);max-width:400px;';e.innerHTML='<strong>✓ Character Data Copied!</strong><p style="margin:10px 0 0;font-size:14px"><strong>'+g.name+'</strong><br>'+g.classes.map(e=>e.name+' '+e.level).join(' / ')+'<br><br>Go to The Shepherd\\'s Guide app and paste this data.</p>';document.body.appendChild(e);setTimeout(()=>e.remove(),8000)}).catch(e=>{prompt('Copy this character data:',b)})}catch(e){alert('Error: '+e.message)}})();'''
+_BOOKMARKLET_BODY = BOOKMARKLET_CODE.encode('utf-8')
+_BOOKMARKLET_GZ = gzip.compress(_BOOKMARKLET_BODY, compresslevel=9)
+
 @app.route('/bookmarklet')
 def bookmarklet():
     """Serve the D&D Beyond extractor bookmarklet code."""
-    bookmarklet_code = '''javascript:(function(){'use strict';function e(e,t=''){const n=document.querySelector(e);return n?n.textContent.trim():t}function t(e,t=0){const n=parseInt(e.replace(/[^\\d-]/g,''),10);return isNaN(n)?t:n}function n(){const e=window.location.pathname.match(/\\/characters\\/(\\d+)/);return e?e[1]:null}function r(e){return{Barbarian:'d12',Bard:'d8',Cleric:'d8',Druid:'d8',Fighter:'d10',Monk:'d8',Paladin:'d10',Ranger:'d10',Rogue:'d8',Sorcerer:'d6',Warlock:'d8',Wizard:'d6'}[e]||'d8'}function a(e){return{Barbarian:'none',Bard:'full',Cleric:'full',Druid:'full',Fighter:'none',Monk:'none',Paladin:'half',Ranger:'half',Rogue:'none',Sorcerer:'full',Warlock:'pact',Wizard:'full'}[e]||'none'}function o(){const n=e('.ddbc-character-summary__classes, .ct-character-summary__classes'),o=[];if(n){const e=n.match(/([A-Za-z]+(?:\\s+[A-Za-z]+)?)\\s*(\\d+)/g);e&&e.forEach(e=>{const t=e.match(/([A-Za-z]+(?:\\s+[A-Za-z]+)?)\\s*(\\d+)/);t&&o.push({name:t[1].trim(),level:parseInt(t[2],10),subclass:'',hit_die:r(t[1].trim()),spellcasting:a(t[1].trim())})})}return o}function s(){const e={},n={STR:'strength',DEX:'dexterity',CON:'constitution',INT:'intelligence',WIS:'wisdom',CHA:'charisma'};return document.querySelectorAll('.ddbc-ability-summary, .ct-ability-summary, .ct-quick-info__ability, .ddbc-quick-info__ability').forEach(r=>{const a=r.querySelector('.ddbc-ability-summary__abbr, .ct-ability-summary__abbr'),o=r.querySelector('.ddbc-ability-summary__secondary, .ct-ability-summary__secondary, .ddbc-ability-summary__primary');if(a&&o){const r=a.textContent.trim().toUpperCase(),s=t(o.textContent);n[r]&&(e[n[r]]=s)}}),e}function c(){let n=0,r=0,a=0;const o=document.querySelector('.ct-health-summary__hp-number, .ddbc-health-summary__hp-number');o&&(n=t(o.textContent));const s=document.querySelector('.ct-health-summary__hp-max, .ddbc-health-summary__hp-max');s&&(r=t(s.textContent));const c=e('.ct-status-summary-mobile__hp, .ddbc-combat-mobile__hp');if(c&&c.includes('/')){const e=c.split('/');2===e.length&&(n=t(e[0]),r=t(e[1]))}const l=document.querySelector('[class*="temp-hp"] [class*="value"]');return l&&(a=t(l.textContent)),{current_hp:n,max_hp:r,temp_hp:a}}function l(){const e=document.querySelector('.ddbc-armor-class-box__value, .ct-armor-class-box__value');return e?t(e.textContent):10}function i(){const t=document.querySelector('.ddbc-speed-box__box-value, .ct-speed-box__box-value'),n=t?t.textContent.trim():'30';return n.includes('ft')?n:n+' ft'}function u(){const e=document.querySelector('.ddbc-proficiency-bonus-box__value, .ct-proficiency-bonus-box__value');return e?t(e.textContent):2}function d(e){const t={mighty_summoner:false,guardian_spirit:false,faithful_summons:false,bear_spirit_active:false},n=document.body.innerText.toLowerCase();return n.includes('mighty summoner')&&(t.mighty_summoner=true),n.includes('guardian spirit')&&(t.guardian_spirit=true),n.includes('faithful summons')&&(t.faithful_summons=true),t}try{if(!window.location.hostname.includes('dndbeyond.com')||!window.location.pathname.includes('/characters/'))return void alert('Please navigate to a D&D Beyond character sheet page first.');const t=n();if(!t)throw new Error('Could not find character ID.');const r=e('.ddbc-character-tidbits__heading h1, .ct-character-tidbits__heading h1'),a=e('.ddbc-character-summary__race, .ct-character-summary__race'),f=e('.ddbc-character-summary__background, .ct-character-summary__background'),m=o(),p=s(),_=c(),h=d(m),g={name:r,race:a,background:f,alignment:'',experience:0,classes:m,total_level:m.reduce((e,t)=>e+t.level,0),ability_scores:p,max_hp:_.max_hp,current_hp:_.current_hp,ac:l(),speed:i(),proficiency_bonus:u(),inspiration:0,proficiencies:{armor:[],weapons:[],tools:[],saving_throws:[],skills:[]},class_features:h,features:'',equipment:'',dndbeyond_sync:{character_id:t,character_url:window.location.href,last_sync:new Date().toISOString(),source:'dndbeyond_bookmarklet'}},b=JSON.stringify(g,null,2);navigator.clipboard.writeText(b).then(()=>{const e=document.createElement('div');e.style.cssText='position:fixed;top:20px;right:20px;background:#28a745;color:white;padding:20px;border-radius:8px;z-index:999999;font-family:Arial;box-shadow:0 4px 12px rgba(0,0,0,0.3);max-width:400px;';e.innerHTML='<strong>✓ Character Data Copied!</strong><p style="margin:10px 0 0;font-size:14px"><strong>'+g.name+'</strong><br>'+g.classes.map(e=>e.name+' '+e.level).join(' / ')+'<br><br>Go to The Shepherd\\'s Guide app and paste this data.</p>';document.body.appendChild(e);setTimeout(()=>e.remove(),8000)}).catch(e=>{prompt('Copy this character data:',b)})}catch(e){alert('Error: '+e.message)}})();'''
-    return bookmarklet_code, 200, {'Content-Type': 'text/plain'}
+    headers = {
+        'Content-Type': 'text/plain; charset=utf-8',
+        'Cache-Control': 'public, max-age=86400',
+        'Vary': 'Accept-Encoding',
+    }
+    if request.accept_encodings['gzip']:
+        headers['Content-Encoding'] = 'gzip'
+        return _BOOKMARKLET_GZ, 200, headers
+    return _BOOKMARKLET_BODY, 200, headers
 
 @app.route('/import-character', methods=['POST'])
 def import_character():
@@ -618,18 +834,19 @@ def import_character():
             # Try to parse from form data
             json_str = request.form.get('character_json', '')
             if not json_str:
-                return json.dumps({'success': False, 'error': 'No character data provided'}), 400
-            imported_data = json.loads(json_str)
+                return _dump_json({'success': False, 'error': 'No character data provided'}), 400
+            imported_data = _parse_json(json_str)
         
         if not imported_data:
-            return json.dumps({'success': False, 'error': 'Empty character data'}), 400
+            return _dump_json({'success': False, 'error': 'Empty character data'}), 400
         
         # Load existing player data to preserve local-only fields
         existing_data = load_player_data()
         
         # Merge imported data with existing data
         # D&D Beyond data takes precedence for synced fields
-        merged_data = copy.deepcopy(existing_data)
+        # (load_player_data returns a fresh copy, so it can be updated in place)
+        merged_data = existing_data
         
         # Update basic info
         for field in ['name', 'race', 'background', 'alignment']:
@@ -708,7 +925,7 @@ def import_character():
         # Save merged data
         save_player_data(merged_data)
         
-        return json.dumps({
+        return _dump_json({
             'success': True,
             'message': f"Successfully imported {merged_data.get('name', 'character')}",
             'character_name': merged_data.get('name', ''),
@@ -716,24 +933,19 @@ def import_character():
         })
         
     except json.JSONDecodeError as e:
-        return json.dumps({'success': False, 'error': f'Invalid JSON: {str(e)}'}), 400
+        return _dump_json({'success': False, 'error': f'Invalid JSON: {str(e)}'}), 400
     except Exception as e:
-        return json.dumps({'success': False, 'error': str(e)}), 500
+        return _dump_json({'success': False, 'error': str(e)}), 500
 
 @app.route('/spells')
 def spells():
     """Display conjuring/summoning spells with their summonable creatures."""
-    conjure_spells = get_conjure_spells()
-    # Sort by level
-    level_order = {'cantrip': 0}
-    conjure_spells.sort(key=lambda x: level_order.get(x.get('level', '0'), int(x.get('level', '0')) if x.get('level', '0').isdigit() else 0))
-    return render_template('spells.html', spells=conjure_spells)
+    return render_template('spells.html', spells=get_conjure_spells())
 
 @app.route('/spell/<name>')
 def spell_detail(name):
     """Display a specific spell with its summonable creatures."""
-    spells = load_spells()
-    spell = next((s for s in spells if s.get('name', '').lower() == name.lower()), None)
+    spell = get_spell_by_name(name)
     if not spell:
         return "Spell not found", 404
     
@@ -744,53 +956,25 @@ def spell_detail(name):
     skill_filter = request.args.get('skill', '')
     trait_filter = request.args.get('trait', '').lower()
     
-    # Apply filters
-    filtered_creatures = creatures
-    
-    if cr_filter:
-        filtered_creatures = [c for c in filtered_creatures 
-                            if str(c.get('Challenge', '')).split()[0] == cr_filter]
-    
-    if skill_filter:
-        filtered_creatures = [c for c in filtered_creatures 
-                            if skill_filter.lower() in c.get('Skills', '').lower()]
-    
-    if trait_filter:
-        filtered_creatures = [c for c in filtered_creatures 
-                            if trait_filter in c.get('Traits', '').lower()]
-    
-    # Extract unique CRs and skills for filter dropdowns
-    available_crs = sorted(set(str(c.get('Challenge', '')).split()[0] for c in creatures if c.get('Challenge')),
-                          key=lambda x: float(x) if '/' not in x else float(x.split('/')[0])/float(x.split('/')[1]))
-    
-    available_skills = set()
-    for c in creatures:
-        skill_str = c.get('Skills', '')
-        if skill_str:
-            for part in skill_str.split(','):
-                skill_name = part.strip().split()[0] if part.strip() else ''
-                if skill_name:
-                    available_skills.add(skill_name)
-    available_skills = sorted(available_skills)
+    # Apply filters in a single pass
+    skill_lower = skill_filter.lower()
+    if cr_filter or skill_lower or trait_filter:
+        filtered_creatures = [c for c in creatures
+                              if (not cr_filter or c['_cr_token'] == cr_filter)
+                              and skill_lower in c['_skills_lower']
+                              and trait_filter in c['_traits_lower']]
+    else:
+        filtered_creatures = creatures
     
-    # Extract common traits
-    available_traits = set()
-    for c in creatures:
-        traits = c.get('Traits', '')
-        if traits:
-            # Extract trait names (usually formatted as "Trait Name." at start of description)
-            import re
-            trait_names = re.findall(r'([A-Z][a-z]+(?: [A-Z][a-z]+)*)\\.', traits)
-            available_traits.update(trait_names)
-    available_traits = sorted(available_traits)
+    options = _SPELL_FILTER_OPTIONS.get(spell.get('name', ''), _NO_FILTER_OPTIONS)
     
     return render_template('spell_detail.html', 
                           spell=spell, 
                           creatures=filtered_creatures,
                           total_creatures=len(creatures),
-                          available_crs=available_crs,
-                          available_skills=available_skills,
-                          available_traits=available_traits,
+                          available_crs=options['crs'],
+                          available_skills=options['skills'],
+                          available_traits=options['traits'],
                           current_cr=cr_filter,
                           current_skill=skill_filter,
                           current_trait=trait_filter)